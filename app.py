@@ -2,16 +2,20 @@
 HTTP server wrapper for Bay Wheels MCP server.
 This module creates a Starlette app with health checks for container deployment.
 """
+import asyncio
 import os
 import logging
 import sys
+import orjson
+from contextlib import asynccontextmanager
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import Response
 from starlette.routing import Route, Mount
 import uvicorn
 
 # Import the MCP server
-from server import mcp
+from server import mcp, close_client, refresh_loop
 
 # Configure logging
 logging.basicConfig(
@@ -24,11 +28,11 @@ logger = logging.getLogger(__name__)
 # Health check endpoint for container orchestration
 async def health_check(request):
     """Health check endpoint for load balancers and orchestrators."""
-    return JSONResponse({
+    return Response(orjson.dumps({
         "status": "healthy",
         "service": "bay-wheels-mcp",
         "version": "0.1.0"
-    })
+    }), media_type="application/json")
 
 # Create the StreamableHTTP app from FastMCP
 mcp_app = mcp.streamable_http_app()
@@ -36,18 +40,47 @@ mcp_app = mcp.streamable_http_app()
 # Add health check route to the MCP app
 mcp_app.routes.insert(0, Route("/health", health_check))
 
+# Wrap the MCP lifespan (which runs the session manager) to also keep the GBFS
+# caches refreshed in the background and close the shared HTTP client on shutdown
+mcp_lifespan = mcp_app.router.lifespan_context
+
+@asynccontextmanager
+async def lifespan(app):
+    async with mcp_lifespan(app):
+        refresh_task = asyncio.create_task(refresh_loop())
+        try:
+            yield
+        finally:
+            refresh_task.cancel()
+            try:
+                await refresh_task
+            except asyncio.CancelledError:
+                pass
+            await close_client()
+
+mcp_app.router.lifespan_context = lifespan
+
+# Compress larger JSON responses (e.g. tools/list); SSE streams are left as-is
+mcp_app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=4)
+
 # Use the MCP app directly
 app = mcp_app
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "8000"))
     host = os.getenv("HOST", "0.0.0.0")
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
 
-    logger.info(f"Starting Bay Wheels MCP HTTP server on {host}:{port}")
+    logger.info(f"Starting Bay Wheels MCP HTTP server on {host}:{port} with {workers} worker(s)")
     uvicorn.run(
-        app,
+        # Multiple worker processes need an import string to load the app
+        "app:app" if workers > 1 else app,
         host=host,
         port=port,
+        # "auto" selects uvloop and httptools when installed (all but Windows)
+        loop="auto",
+        http="auto",
+        workers=workers,
         log_level="info",
         access_log=True
     )
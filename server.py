@@ -3,10 +3,13 @@ import httpx
 import math
 import os
 import sys
+import time
 import logging
+import numpy as np
+import orjson
+from collections import OrderedDict
 from mcp.server.fastmcp import FastMCP
-from geopy.distance import geodesic
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple, Tuple
 
 # Configure logging for container compatibility
 logging.basicConfig(
@@ -20,21 +23,353 @@ logger = logging.getLogger(__name__)
 mcp = FastMCP("bay-wheels")
 
 GBFS_DISCOVERY_URL = "https://gbfs.baywheels.com/gbfs/2.3/gbfs.json"
+EARTH_RADIUS_M = 6371000.0
 
-async def get_feed_url(feed_name: str) -> str:
-    async with httpx.AsyncClient() as client:
-        response = await client.get(GBFS_DISCOVERY_URL)
-        data = response.json()
-        feeds = data.get("data", {}).get("en", {}).get("feeds", [])
-        for feed in feeds:
-            if feed.get("name") == feed_name:
-                return feed.get("url")
-    raise ValueError(f"Feed {feed_name} not found")
-
-async def fetch_feed(url: str) -> Dict[str, Any]:
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
-        return response.json()
+def _distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters between two points given in degrees."""
+    lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((lat2_rad - lat1_rad) * 0.5) ** 2
+         + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(math.radians(lon2 - lon1) * 0.5) ** 2)
+    return 2.0 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+def _haversine_m(
+    lat0_rad: float, lon0_rad: float, cos_lat0: float, lats_rad: np.ndarray, lons_rad: np.ndarray
+) -> np.ndarray:
+    """Great-circle distance in meters from one point to arrays of points, all in radians."""
+    a = (np.sin((lats_rad - lat0_rad) * 0.5) ** 2
+         + cos_lat0 * np.cos(lats_rad) * np.sin((lons_rad - lon0_rad) * 0.5) ** 2)
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+def _haversine_min(
+    lat0_rad: float, lon0_rad: float, cos_lat0: float, lats_rad: List[float], lons_rad: List[float]
+) -> Tuple[int, float]:
+    """Position and distance in meters of the closest of a few points, as a plain loop."""
+    best, best_a = -1, math.inf
+    for i, (lat, lon) in enumerate(zip(lats_rad, lons_rad)):
+        a = (math.sin((lat - lat0_rad) * 0.5) ** 2
+             + cos_lat0 * math.cos(lat) * math.sin((lon - lon0_rad) * 0.5) ** 2)
+        if a < best_a:
+            best, best_a = i, a
+    return best, 2.0 * EARTH_RADIUS_M * math.asin(math.sqrt(best_a))
+
+# Below this many candidates NumPy's per-call overhead outweighs vectorizing
+SCALAR_SEARCH_MAX = 24
+
+def _closest(
+    lat0_rad: float, lon0_rad: float, cos_lat0: float,
+    lats_rad: np.ndarray, lons_rad: np.ndarray, candidates: np.ndarray
+) -> Tuple[int, float]:
+    if candidates.size <= SCALAR_SEARCH_MAX:
+        best, dist = _haversine_min(
+            lat0_rad, lon0_rad, cos_lat0, lats_rad[candidates].tolist(), lons_rad[candidates].tolist()
+        )
+        return int(candidates[best]), dist
+    dists = _haversine_m(lat0_rad, lon0_rad, cos_lat0, lats_rad[candidates], lons_rad[candidates])
+    best = int(np.argmin(dists))
+    return int(candidates[best]), float(dists[best])
+
+# Bounding-box search grows from this radius up to the cap, then scans everything
+SEARCH_RADIUS_START_M = 1500.0
+SEARCH_RADIUS_MAX_M = 25000.0
+
+def _nearest(
+    lat0: float, lon0: float, lats_rad: np.ndarray, lons_rad: np.ndarray, mask: Optional[np.ndarray] = None
+) -> Optional[Tuple[int, float]]:
+    """
+    Index and distance in meters of the closest point where mask is set, or None.
+
+    Only points inside a lat/lon box around the origin are measured. The box
+    doubles until its nearest point is no farther than the box half-width (so
+    nothing outside can be closer), falling back to a full scan past the cap.
+    """
+    if mask is None:
+        mask = np.ones(len(lats_rad), dtype=bool)
+    elif not mask.any():
+        return None
+    lat0_rad, lon0_rad = math.radians(lat0), math.radians(lon0)
+    cos_lat0 = math.cos(lat0_rad)
+
+    radius_m = SEARCH_RADIUS_START_M
+    while radius_m <= SEARCH_RADIUS_MAX_M:
+        dlat = radius_m / EARTH_RADIUS_M
+        # Size longitude for the poleward edge, where degrees are shortest
+        cos_edge = math.cos(min(abs(lat0_rad) + dlat, math.pi / 2))
+        dlon = dlat / cos_edge if cos_edge > 1e-9 else 2 * math.pi
+        candidates = np.flatnonzero(
+            mask & (np.abs(lats_rad - lat0_rad) < dlat) & (np.abs(lons_rad - lon0_rad) < dlon)
+        )
+        if candidates.size:
+            idx, dist = _closest(lat0_rad, lon0_rad, cos_lat0, lats_rad, lons_rad, candidates)
+            if dist <= radius_m:
+                return idx, dist
+        radius_m *= 2
+
+    candidates = np.flatnonzero(mask)
+    if not candidates.size:
+        return None
+    return _closest(lat0_rad, lon0_rad, cos_lat0, lats_rad, lons_rad, candidates)
+
+DISCOVERY_DEFAULT_TTL = 3600
+
+# Shared HTTP client so connections (and HTTP/2 streams) are reused across calls
+_client: Optional[httpx.AsyncClient] = None
+
+async def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    return _client
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# Feed name -> URL map from the discovery document, refreshed per its ttl
+_feed_urls: Dict[str, str] = {}
+_feed_urls_expiry: float = 0.0
+_feed_urls_lock = asyncio.Lock()
+
+async def _load_discovery() -> Dict[str, str]:
+    global _feed_urls, _feed_urls_expiry
+    async with _feed_urls_lock:
+        if time.monotonic() >= _feed_urls_expiry:
+            client = await _get_client()
+            response = await client.get(GBFS_DISCOVERY_URL)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            feeds = data.get("data", {}).get("en", {}).get("feeds", [])
+            _feed_urls = {feed.get("name"): feed.get("url") for feed in feeds}
+            _feed_urls_expiry = time.monotonic() + data.get("ttl", DISCOVERY_DEFAULT_TTL)
+    return _feed_urls
+
+# Minimum seconds a fetched feed is reused; a longer ttl in the payload wins
+FEED_TTLS = {
+    "station_information": 300,
+    "station_status": 10,
+    "free_bike_status": 10,
+}
+FEED_DEFAULT_TTL = 10
+
+# While refresh_loop is running, expired feeds are still served for this long
+# instead of being refetched inline, since the loop is about to replace them
+STALE_WHILE_REFRESHING = 30
+
+# Feed URL -> {"data", "etag", "last_modified", "expires_at"}
+_feed_cache: Dict[str, Dict[str, Any]] = {}
+_refreshing = False
+
+async def fetch_feed(url: str, ttl: float = FEED_DEFAULT_TTL, allow_stale: bool = True) -> Dict[str, Any]:
+    cached = _feed_cache.get(url)
+    grace = STALE_WHILE_REFRESHING if allow_stale and _refreshing else 0
+    if cached and time.monotonic() < cached["expires_at"] + grace:
+        return cached["data"]
+
+    # Revalidate with the validators from the last response, if any
+    headers = {}
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["last_modified"]:
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    client = await _get_client()
+    response = await client.get(url, headers=headers)
+
+    if cached and response.status_code == 304:
+        cached["expires_at"] = time.monotonic() + max(ttl, cached["data"].get("ttl", 0))
+        return cached["data"]
+
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    _feed_cache[url] = {
+        "data": data,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "expires_at": time.monotonic() + max(ttl, data.get("ttl", 0)),
+    }
+    return data
+
+async def fetch_feeds(*feed_names: str, allow_stale: bool = True) -> List[Dict[str, Any]]:
+    """Fetch the named GBFS feeds concurrently after a single discovery lookup."""
+    feed_urls = await _load_discovery()
+    for feed_name in feed_names:
+        if not feed_urls.get(feed_name):
+            raise ValueError(f"Feed {feed_name} not found")
+    return await asyncio.gather(*(
+        fetch_feed(feed_urls[feed_name], FEED_TTLS.get(feed_name, FEED_DEFAULT_TTL), allow_stale)
+        for feed_name in feed_names
+    ))
+
+class StationArrays(NamedTuple):
+    """station_information as parallel arrays, indexed by station position."""
+    ids: List[str]
+    names: List[str]
+    lats: np.ndarray
+    lons: np.ndarray
+    lats_rad: np.ndarray
+    lons_rad: np.ndarray
+    index: Dict[str, int]
+
+class StationStatusArrays(NamedTuple):
+    """station_status aligned to StationArrays; missing stations are closed and empty."""
+    is_renting: np.ndarray
+    is_returning: np.ndarray
+    num_bikes_available: np.ndarray
+    num_docks_available: np.ndarray
+    veh_type_counts: Dict[str, np.ndarray]
+
+class FreeBikeArrays(NamedTuple):
+    """Rentable (not reserved or disabled) free bikes as parallel arrays."""
+    bike_ids: List[str]
+    type_masks: Dict[str, np.ndarray]
+    lats: np.ndarray
+    lons: np.ndarray
+    lats_rad: np.ndarray
+    lons_rad: np.ndarray
+
+def _build_station_arrays(station_info_data: Dict[str, Any]) -> StationArrays:
+    stations = station_info_data["data"]["stations"]
+    n = len(stations)
+    ids = [s["station_id"] for s in stations]
+    lats = np.fromiter((s["lat"] for s in stations), dtype=np.float64, count=n)
+    lons = np.fromiter((s["lon"] for s in stations), dtype=np.float64, count=n)
+    return StationArrays(
+        ids=ids,
+        names=[s["name"] for s in stations],
+        lats=lats,
+        lons=lons,
+        # float32 resolves ~0.4 m here, plenty for ranking; reported distances
+        # are recomputed from the float64 coordinates
+        lats_rad=np.radians(lats).astype(np.float32),
+        lons_rad=np.radians(lons).astype(np.float32),
+        index={station_id: i for i, station_id in enumerate(ids)},
+    )
+
+def _build_status_arrays(station_status_data: Dict[str, Any], stations: StationArrays) -> StationStatusArrays:
+    n = len(stations.ids)
+    is_renting = np.zeros(n, dtype=bool)
+    is_returning = np.zeros(n, dtype=bool)
+    num_bikes_available = np.zeros(n, dtype=np.int32)
+    num_docks_available = np.zeros(n, dtype=np.int32)
+    veh_type_counts: Dict[str, np.ndarray] = {}
+
+    for status in station_status_data["data"]["stations"]:
+        i = stations.index.get(status["station_id"])
+        if i is None:
+            continue
+        is_renting[i] = bool(status.get("is_renting"))
+        is_returning[i] = bool(status.get("is_returning"))
+        num_bikes_available[i] = status.get("num_bikes_available", 0)
+        num_docks_available[i] = status.get("num_docks_available", 0)
+        for v in status.get("vehicle_types_available", []):
+            type_counts = veh_type_counts.get(v.get("vehicle_type_id"))
+            if type_counts is None:
+                type_counts = veh_type_counts[v.get("vehicle_type_id")] = np.zeros(n, dtype=np.int32)
+            type_counts[i] += v.get("count", 0)
+
+    return StationStatusArrays(is_renting, is_returning, num_bikes_available, num_docks_available, veh_type_counts)
+
+def _build_free_bike_arrays(free_bike_data: Dict[str, Any]) -> FreeBikeArrays:
+    bikes = [
+        bike for bike in free_bike_data["data"]["bikes"]
+        if not (bike.get("is_reserved") or bike.get("is_disabled"))
+    ]
+    n = len(bikes)
+    lats = np.fromiter((b["lat"] for b in bikes), dtype=np.float64, count=n)
+    lons = np.fromiter((b["lon"] for b in bikes), dtype=np.float64, count=n)
+    vehicle_type_ids = np.array([b.get("vehicle_type_id") or "" for b in bikes], dtype=str)
+    return FreeBikeArrays(
+        bike_ids=[b.get("bike_id", "unknown") for b in bikes],
+        type_masks={type_id: vehicle_type_ids == type_id for type_id in set(vehicle_type_ids.tolist())},
+        lats=lats,
+        lons=lons,
+        lats_rad=np.radians(lats).astype(np.float32),
+        lons_rad=np.radians(lons).astype(np.float32),
+    )
+
+# Arrays built from the feed payloads they were derived from; fetch_feed returns
+# the same payload object until the feed changes, so identity marks staleness
+_station_arrays: Optional[Tuple[Dict[str, Any], StationArrays]] = None
+_status_arrays: Optional[Tuple[Dict[str, Any], StationStatusArrays]] = None
+_free_bike_arrays: Optional[Tuple[Dict[str, Any], FreeBikeArrays]] = None
+
+def get_station_arrays(
+    station_info_data: Dict[str, Any], station_status_data: Dict[str, Any]
+) -> Tuple[StationArrays, StationStatusArrays]:
+    global _station_arrays, _status_arrays
+    if _station_arrays is None or _station_arrays[0] is not station_info_data:
+        _station_arrays = (station_info_data, _build_station_arrays(station_info_data))
+        _status_arrays = None
+    stations = _station_arrays[1]
+    if _status_arrays is None or _status_arrays[0] is not station_status_data:
+        _status_arrays = (station_status_data, _build_status_arrays(station_status_data, stations))
+    return stations, _status_arrays[1]
+
+def get_free_bike_arrays(free_bike_data: Dict[str, Any]) -> FreeBikeArrays:
+    global _free_bike_arrays
+    if _free_bike_arrays is None or _free_bike_arrays[0] is not free_bike_data:
+        _free_bike_arrays = (free_bike_data, _build_free_bike_arrays(free_bike_data))
+    return _free_bike_arrays[1]
+
+REFRESH_MIN_INTERVAL = 10
+
+async def refresh_loop() -> None:
+    """
+    Keep the GBFS feeds and the arrays built from them warm in the background.
+
+    Wakes when the earliest cached feed expires (at least every
+    REFRESH_MIN_INTERVAL seconds), revalidates whatever has expired and rebuilds
+    the arrays, so tool calls find them ready instead of waiting on the network.
+    """
+    global _refreshing
+    _refreshing = True
+    try:
+        while True:
+            try:
+                station_info_data, station_status_data, free_bike_data = await fetch_feeds(
+                    "station_information", "station_status", "free_bike_status", allow_stale=False
+                )
+                get_station_arrays(station_info_data, station_status_data)
+                get_free_bike_arrays(free_bike_data)
+            except Exception as e:
+                logger.warning(f"Background GBFS refresh failed: {e}")
+
+            next_expiry = min((entry["expires_at"] for entry in _feed_cache.values()), default=0.0)
+            await asyncio.sleep(max(next_expiry - time.monotonic(), REFRESH_MIN_INTERVAL))
+    finally:
+        _refreshing = False
+
+# Recent tool answers, keyed by coordinates rounded to ~10 m, since LLM callers
+# tend to ask about the same places; the ttl matches station_status freshness
+RESPONSE_CACHE_TTL = 15
+RESPONSE_CACHE_SIZE = 256
+_response_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, str]]" = OrderedDict()
+
+def _response_cache_key(tool: str, latitude: float, longitude: float, *args: Any) -> Tuple[Any, ...]:
+    return (tool, round(latitude, 4), round(longitude, 4), *args)
+
+def _get_cached_response(key: Tuple[Any, ...]) -> Optional[str]:
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if time.monotonic() >= expires_at:
+        del _response_cache[key]
+        return None
+    _response_cache.move_to_end(key)
+    return result
+
+def _cache_response(key: Tuple[Any, ...], result: str) -> None:
+    _response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, result)
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
 
 @mcp.tool()
 async def find_nearest_bike(latitude: float, longitude: float, count: int = 1, bike_type: Optional[str] = None) -> str:
@@ -47,23 +382,21 @@ async def find_nearest_bike(latitude: float, longitude: float, count: int = 1, b
         count: The number of bikes needed (default 1).
         bike_type: Optional type of bike ('electric_bike' or 'classic_bike'). If None, any type.
     """
-    try:
-        station_info_url = await get_feed_url("station_information")
-        station_status_url = await get_feed_url("station_status")
-        free_bike_status_url = await get_feed_url("free_bike_status")
-
-        # Fetch data concurrently
-        station_info_data, station_status_data, free_bike_data = await asyncio.gather(
-            fetch_feed(station_info_url),
-            fetch_feed(station_status_url),
-            fetch_feed(free_bike_status_url)
-        )
+    cache_key = _response_cache_key("find_nearest_bike", latitude, longitude, count, bike_type)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
 
-        stations = {s["station_id"]: s for s in station_info_data["data"]["stations"]}
-        statuses = {s["station_id"]: s for s in station_status_data["data"]["stations"]}
-        free_bikes = free_bike_data["data"]["bikes"]
+    try:
+        # Free bikes only qualify for a single bike, so skip that feed otherwise
+        feed_names = ["station_information", "station_status"]
+        if count == 1:
+            feed_names.append("free_bike_status")
+        feeds = await fetch_feeds(*feed_names)
+        station_info_data, station_status_data = feeds[0], feeds[1]
+        free_bike_data = feeds[2] if count == 1 else None
 
-        candidates = []
+        stations, statuses = get_station_arrays(station_info_data, station_status_data)
 
         # Map user friendly names to vehicle_type_ids
         # 1: classic, 2: electric
@@ -75,64 +408,53 @@ async def find_nearest_bike(latitude: float, longitude: float, count: int = 1, b
                 target_type_id = "1"
 
         # Check stations
-        for station_id, station in stations.items():
-            status = statuses.get(station_id)
-            if not status or not status.get("is_renting"):
-                continue
+        if target_type_id:
+            counts = statuses.veh_type_counts.get(target_type_id)
+            if counts is None:
+                counts = np.zeros(len(stations.ids), dtype=np.int32)
+        else:
+            counts = statuses.num_bikes_available
 
-            available_count = 0
-            if target_type_id:
-                # Check specific vehicle types available
-                if "vehicle_types_available" in status:
-                    for v in status["vehicle_types_available"]:
-                        if v.get("vehicle_type_id") == target_type_id:
-                            available_count += v.get("count", 0)
-            else:
-                # Any bike
-                available_count = status.get("num_bikes_available", 0)
-
-            if available_count >= count:
-                dist = geodesic((latitude, longitude), (station["lat"], station["lon"])).meters
-                candidates.append({
-                    "type": "Station",
-                    "name": station["name"],
-                    "distance": dist,
-                    "available": available_count,
-                    "lat": station["lat"],
-                    "lon": station["lon"]
-                })
+        station = _nearest(
+            latitude, longitude, stations.lats_rad, stations.lons_rad,
+            statuses.is_renting & (counts >= count)
+        )
 
         # Check free bikes (only if count is 1)
-        if count == 1:
-            for bike in free_bikes:
-                if bike.get("is_reserved") or bike.get("is_disabled"):
-                    continue
-                
-                # Filter by bike type if requested
-                if target_type_id and bike.get("vehicle_type_id") != target_type_id:
-                    continue
-                
-                dist = geodesic((latitude, longitude), (bike["lat"], bike["lon"])).meters
-                candidates.append({
-                    "type": "Free Bike",
-                    "name": f"Free Bike ({bike.get('bike_id', 'unknown')})",
-                    "distance": dist,
-                    "available": 1,
-                    "lat": bike["lat"],
-                    "lon": bike["lon"]
-                })
-
-        if not candidates:
-            return "No bikes found matching criteria."
+        free_bike = None
+        if free_bike_data:
+            bikes = get_free_bike_arrays(free_bike_data)
+            # Filter by bike type if requested
+            type_mask = None
+            if target_type_id:
+                type_mask = bikes.type_masks.get(target_type_id)
+                if type_mask is None:
+                    type_mask = np.zeros(len(bikes.bike_ids), dtype=bool)
+            free_bike = _nearest(latitude, longitude, bikes.lats_rad, bikes.lons_rad, type_mask)
 
-        # Sort by distance
-        candidates.sort(key=lambda x: x["distance"])
-        nearest = candidates[0]
+        # Stations win ties; details are only looked up for the winner
+        if free_bike and (station is None or free_bike[1] < station[1]):
+            idx = free_bike[0]
+            option = "Free Bike"
+            name = f"Free Bike ({bikes.bike_ids[idx]})"
+            available = 1
+            lat, lon = float(bikes.lats[idx]), float(bikes.lons[idx])
+        elif station:
+            idx = station[0]
+            option = "Station"
+            name = stations.names[idx]
+            available = int(counts[idx])
+            lat, lon = float(stations.lats[idx]), float(stations.lons[idx])
+        else:
+            return "No bikes found matching criteria."
+        dist = _distance_m(latitude, longitude, lat, lon)
 
-        return (f"Nearest option: {nearest['type']} - {nearest['name']}\n"
-                f"Distance: {nearest['distance']:.1f} meters\n"
-                f"Available: {nearest['available']}\n"
-                f"Location: {nearest['lat']}, {nearest['lon']}")
+        result = (f"Nearest option: {option} - {name}\n"
+                  f"Distance: {dist:.1f} meters\n"
+                  f"Available: {available}\n"
+                  f"Location: {lat}, {lon}")
+        _cache_response(cache_key, result)
+        return result
 
     except Exception as e:
         return f"Error finding nearest bike: {str(e)}"
@@ -147,45 +469,31 @@ async def find_nearest_dock_spaces(latitude: float, longitude: float, count: int
         longitude: The longitude of the search location.
         count: The number of spaces needed (default 1).
     """
-    try:
-        station_info_url = await get_feed_url("station_information")
-        station_status_url = await get_feed_url("station_status")
-
-        station_info_data, station_status_data = await asyncio.gather(
-            fetch_feed(station_info_url),
-            fetch_feed(station_status_url)
-        )
-
-        stations = {s["station_id"]: s for s in station_info_data["data"]["stations"]}
-        statuses = {s["station_id"]: s for s in station_status_data["data"]["stations"]}
+    cache_key = _response_cache_key("find_nearest_dock_spaces", latitude, longitude, count)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        return cached
 
-        candidates = []
-
-        for station_id, station in stations.items():
-            status = statuses.get(station_id)
-            if not status or not status.get("is_returning"):
-                continue
+    try:
+        station_info_data, station_status_data = await fetch_feeds("station_information", "station_status")
 
-            if status.get("num_docks_available", 0) >= count:
-                dist = geodesic((latitude, longitude), (station["lat"], station["lon"])).meters
-                candidates.append({
-                    "name": station["name"],
-                    "distance": dist,
-                    "available": status["num_docks_available"],
-                    "lat": station["lat"],
-                    "lon": station["lon"]
-                })
+        stations, statuses = get_station_arrays(station_info_data, station_status_data)
 
-        if not candidates:
+        found = _nearest(
+            latitude, longitude, stations.lats_rad, stations.lons_rad,
+            statuses.is_returning & (statuses.num_docks_available >= count)
+        )
+        if not found:
             return "No docks found with sufficient spaces."
 
-        candidates.sort(key=lambda x: x["distance"])
-        nearest = candidates[0]
-
-        return (f"Nearest dock with spaces: {nearest['name']}\n"
-                f"Distance: {nearest['distance']:.1f} meters\n"
-                f"Spaces Available: {nearest['available']}\n"
-                f"Location: {nearest['lat']}, {nearest['lon']}")
+        idx = found[0]
+        dist = _distance_m(latitude, longitude, stations.lats[idx], stations.lons[idx])
+        result = (f"Nearest dock with spaces: {stations.names[idx]}\n"
+                  f"Distance: {dist:.1f} meters\n"
+                  f"Spaces Available: {statuses.num_docks_available[idx]}\n"
+                  f"Location: {stations.lats[idx]}, {stations.lons[idx]}")
+        _cache_response(cache_key, result)
+        return result
 
     except Exception as e:
         return f"Error finding nearest dock spaces: {str(e)}"